@@ -0,0 +1,368 @@
+import argparse
+import json
+import re
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+
+MAX_MINUTE = 130
+BUCKET_MINUTES = 10
+SCORE_STATES = ('领先', '平局', '落后')
+
+
+def parse_minute_parts(text: str) -> Optional[Tuple[int, int]]:
+    """解析比赛分钟为 (常规分钟, 补时分钟)，如 45+2' -> (45, 2)，失败返回 None"""
+    found = re.search(r"(\d+)\s*(?:\+\s*(\d+))?\s*['′]", text or '')
+    if not found:
+        return None
+    return int(found.group(1)), int(found.group(2) or 0)
+
+
+def parse_minute(text: str) -> Optional[int]:
+    """从事件文本或状态中解析比赛分钟（补时计入，45+2' -> 47），失败返回 None"""
+    parts = parse_minute_parts(text)
+    if parts is None:
+        return None
+    return max(0, min(parts[0] + parts[1], MAX_MINUTE))
+
+
+def parse_status_minute(status: str) -> Optional[int]:
+    """从比赛状态解析当前分钟，中场按45分钟计"""
+    minute = parse_minute(status)
+    if minute is None and '中场' in (status or ''):
+        minute = 45
+    return minute
+
+
+def is_second_half(text: str, minute: int) -> bool:
+    """按常规分钟划分半场，上半场补时（45+2'）仍算上半场"""
+    parts = parse_minute_parts(text)
+    base = parts[0] if parts else minute
+    return base > 45
+
+
+def parse_sides(text: str) -> Tuple[bool, bool]:
+    """判断事件属于主队/客队（与 save_corner_data 原有规则一致）"""
+    lower = text.lower()
+    is_home = '主队' in text or 'home' in lower or '主' in text
+    is_away = '客队' in text or 'away' in lower or '客' in text
+    return is_home, is_away
+
+
+def parse_score(score: str) -> Optional[Tuple[int, int]]:
+    """解析比分 1:0 / 1：0"""
+    found = re.match(r'^\s*(\d+)\s*[:：]\s*(\d+)\s*$', score or '')
+    if not found:
+        return None
+    return int(found.group(1)), int(found.group(2))
+
+
+class MatchAnalytics:
+    """单场比赛的滚动角球统计，每次更新 O(1)（窗口过期按分钟摊还）"""
+
+    def __init__(self, match_id: str, window: int = 10):
+        self.match_id = match_id
+        self.window = window
+        self.league = '未知'
+        self.minute = 0
+        self.total = 0
+        self.home = 0
+        self.away = 0
+        self.halves = [0, 0]
+        self.buckets = [0] * (MAX_MINUTE // BUCKET_MINUTES + 1)
+        self.per_minute = [0] * (MAX_MINUTE + 1)
+        self.window_count = 0
+        self.expired_upto = -1
+        self.score = None
+        self.finished = False
+        self.state_corners = {state: 0 for state in SCORE_STATES}
+        self.state_minutes = {state: 0 for state in SCORE_STATES}
+
+    def score_state(self) -> Optional[str]:
+        """主队视角的比分状态"""
+        if self.score is None:
+            return None
+        home, away = self.score
+        if home > away:
+            return '领先'
+        if home < away:
+            return '落后'
+        return '平局'
+
+    def advance(self, minute: int):
+        """推进比赛分钟：累计比分状态时长并让滚动窗口过期"""
+        if minute <= self.minute:
+            return
+        state = self.score_state()
+        if state:
+            self.state_minutes[state] += minute - self.minute
+        self.minute = minute
+
+        cutoff = self.minute - self.window
+        while self.expired_upto < cutoff:
+            self.expired_upto += 1
+            self.window_count -= self.per_minute[self.expired_upto]
+
+    def add_corner(self, text: str):
+        """记录一个角球"""
+        minute = parse_minute(text)
+        if minute is None:
+            minute = self.minute
+        # 只有当前分钟及以后的角球才能确定当时比分；中途加入时补录的历史角球不计入比分状态
+        in_score_state = minute >= self.minute
+        self.advance(minute)
+
+        is_home, is_away = parse_sides(text)
+        self.total += 1
+        self.home += is_home
+        self.away += is_away
+        self.halves[1 if is_second_half(text, minute) else 0] += 1
+        self.buckets[minute // BUCKET_MINUTES] += 1
+        self.per_minute[minute] += 1
+        if minute > self.expired_upto:
+            self.window_count += 1
+
+        state = self.score_state()
+        if state and in_score_state:
+            self.state_corners[state] += 1
+
+    def stats(self) -> Dict:
+        """供输出文件/表格使用的统计"""
+        rates = {}
+        for state in SCORE_STATES:
+            minutes = self.state_minutes[state]
+            rates[state] = round(self.state_corners[state] * 90 / minutes, 2) if minutes else None
+        return {
+            'total': self.total,
+            'home': self.home,
+            'away': self.away,
+            'league': self.league,
+            'minute': self.minute,
+            'first_half': self.halves[0],
+            'second_half': self.halves[1],
+            f'last_{self.window}min': self.window_count,
+            'per_10min': {f'{i * BUCKET_MINUTES}-{i * BUCKET_MINUTES + BUCKET_MINUTES - 1}': count
+                          for i, count in enumerate(self.buckets) if count},
+            'by_score_state': dict(self.state_corners),
+            'rate_per_90_by_score_state': rates
+        }
+
+
+class CornerAnalytics:
+    """全部比赛的增量角球统计（单场、全局、按联赛），由事件采集路径直接喂入"""
+
+    def __init__(self, window: int = 10):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        """清空所有统计"""
+        self.matches = {}
+        self.total = 0
+        self.home = 0
+        self.away = 0
+        self.window_total = 0
+        self.league_totals = {}
+        self.by_window_count = {}
+
+    def _match(self, match_id: str) -> MatchAnalytics:
+        if match_id not in self.matches:
+            self.matches[match_id] = MatchAnalytics(match_id, self.window)
+            self.by_window_count.setdefault(0, set()).add(match_id)
+        stats = self.matches[match_id]
+        if stats.finished:
+            # 已停止监控的比赛重新进入监控
+            stats.finished = False
+            self.window_total += stats.window_count
+            self.by_window_count.setdefault(stats.window_count, set()).add(match_id)
+        return stats
+
+    def _reindex(self, stats: MatchAnalytics, before: int):
+        """滚动窗口计数变化后，移动该场比赛在计数索引中的位置"""
+        after = stats.window_count
+        if after == before:
+            return
+        self.window_total += after - before
+        self.by_window_count[before].discard(stats.match_id)
+        self.by_window_count.setdefault(after, set()).add(stats.match_id)
+
+    def update_match(self, match_id: str, match_info: Dict):
+        """同步比分、状态、联赛（每轮监控循环调用）"""
+        stats = self._match(match_id)
+        if match_info.get('league'):
+            stats.league = match_info['league']
+
+        before = stats.window_count
+        minute = parse_status_minute(match_info.get('status', ''))
+        if minute is not None:
+            stats.advance(minute)
+
+        score = parse_score(match_info.get('score', ''))
+        if score is not None:
+            stats.score = score
+        self._reindex(stats, before)
+
+    def add_corners(self, match_id: str, corners: List[str]):
+        """录入新增角球"""
+        stats = self._match(match_id)
+        for text in corners:
+            before = stats.window_count
+            stats.add_corner(text)
+            self._reindex(stats, before)
+
+            is_home, is_away = parse_sides(text)
+            self.total += 1
+            self.home += is_home
+            self.away += is_away
+            self.league_totals[stats.league] = self.league_totals.get(stats.league, 0) + 1
+
+    def finish_match(self, match_id: str):
+        """比赛结束或停止监控：移出滚动窗口合计和热门索引，累计统计保留"""
+        stats = self.matches.get(match_id)
+        if stats is None or stats.finished:
+            return
+        stats.finished = True
+        self.window_total -= stats.window_count
+        self.by_window_count[stats.window_count].discard(match_id)
+
+    def match_stats(self, match_id: str) -> Dict:
+        """单场统计，未知比赛返回空统计"""
+        if match_id not in self.matches:
+            return MatchAnalytics(match_id, self.window).stats()
+        return self.matches[match_id].stats()
+
+    def hot_matches(self, min_corners: int = 3) -> List[str]:
+        """最近 window 分钟内角球数 ≥ min_corners 的比赛"""
+        result = []
+        for count, ids in self.by_window_count.items():
+            if count >= min_corners:
+                result.extend(ids)
+        return sorted(result)
+
+    def summary(self) -> Dict:
+        """全局统计"""
+        halves = [0, 0]
+        for stats in self.matches.values():
+            halves[0] += stats.halves[0]
+            halves[1] += stats.halves[1]
+        return {
+            'total': self.total,
+            'home': self.home,
+            'away': self.away,
+            'first_half': halves[0],
+            'second_half': halves[1],
+            f'last_{self.window}min': self.window_total,
+            'per_league': dict(self.league_totals),
+            'hot_matches': self.hot_matches()
+        }
+
+    def backfill(self, corner_data: Dict):
+        """用历史数据批量重算（NumPy 向量化）。
+
+        corner_data 可以是 corner_only_data 或 save_corner_data 输出中的 matches；
+        历史数据没有比分时间线，因此不重算比分状态统计（两种路径结果一致）。
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            print("未安装 numpy，逐条重放历史角球")
+            self.reset()
+            for match_id, data in corner_data.items():
+                info = data.get('match_info', {})
+                self.update_match(match_id, {'status': info.get('status', ''), 'league': info.get('league')})
+                self.add_corners(match_id, data.get('corners', data.get('events', [])))
+                self.matches[match_id].score = parse_score(info.get('score', ''))
+            return
+
+        self.reset()
+        ids = list(corner_data.keys())
+        match_idx, minutes, base_minutes, homes, aways = [], [], [], [], []
+        for i, match_id in enumerate(ids):
+            data = corner_data[match_id]
+            stats = self._match(match_id)
+            info = data.get('match_info', {})
+            stats.league = info.get('league') or stats.league
+            stats.score = parse_score(info.get('score', ''))
+            status_minute = parse_status_minute(info.get('status', ''))
+            for text in data.get('corners', data.get('events', [])):
+                minute = parse_minute(text)
+                parts = parse_minute_parts(text)
+                is_home, is_away = parse_sides(text)
+                match_idx.append(i)
+                minutes.append(-1 if minute is None else minute)
+                base_minutes.append(-1 if parts is None else parts[0])
+                homes.append(is_home)
+                aways.append(is_away)
+            stats.minute = status_minute or 0
+
+        if not match_idx:
+            return
+
+        n = len(ids)
+        match_idx = np.asarray(match_idx, dtype=np.int64)
+        minutes = np.asarray(minutes, dtype=np.int64)
+        homes = np.asarray(homes, dtype=bool)
+        aways = np.asarray(aways, dtype=bool)
+
+        # 没有分钟的角球归到该场已知的最大分钟
+        current = np.array([self.matches[m].minute for m in ids], dtype=np.int64)
+        np.maximum.at(current, match_idx, minutes)
+        minutes = np.where(minutes < 0, current[match_idx], minutes)
+        base_minutes = np.asarray(base_minutes, dtype=np.int64)
+        base_minutes = np.where(base_minutes < 0, minutes, base_minutes)
+
+        totals = np.bincount(match_idx, minlength=n)
+        home_counts = np.bincount(match_idx, weights=homes, minlength=n).astype(np.int64)
+        away_counts = np.bincount(match_idx, weights=aways, minlength=n).astype(np.int64)
+        second_half = base_minutes > 45
+        halves = np.stack([np.bincount(match_idx[~second_half], minlength=n),
+                           np.bincount(match_idx[second_half], minlength=n)], axis=1)
+        n_buckets = MAX_MINUTE // BUCKET_MINUTES + 1
+        buckets = np.bincount(match_idx * n_buckets + minutes // BUCKET_MINUTES,
+                              minlength=n * n_buckets).reshape(n, n_buckets)
+        per_minute = np.bincount(match_idx * (MAX_MINUTE + 1) + minutes,
+                                 minlength=n * (MAX_MINUTE + 1)).reshape(n, MAX_MINUTE + 1)
+        in_window = minutes > (current[match_idx] - self.window)
+        window_counts = np.bincount(match_idx[in_window], minlength=n)
+
+        self.by_window_count = {}
+        for i, match_id in enumerate(ids):
+            stats = self.matches[match_id]
+            stats.minute = int(current[i])
+            stats.total = int(totals[i])
+            stats.home = int(home_counts[i])
+            stats.away = int(away_counts[i])
+            stats.halves = [int(halves[i, 0]), int(halves[i, 1])]
+            stats.buckets = buckets[i].tolist()
+            stats.per_minute = per_minute[i].tolist()
+            stats.window_count = int(window_counts[i])
+            stats.expired_upto = max(-1, stats.minute - self.window)
+            self.by_window_count.setdefault(stats.window_count, set()).add(match_id)
+            self.league_totals[stats.league] = self.league_totals.get(stats.league, 0) + stats.total
+
+        self.total = int(totals.sum())
+        self.home = int(home_counts.sum())
+        self.away = int(away_counts.sum())
+        self.window_total = int(window_counts.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='从角球数据文件回填统计')
+    parser.add_argument('file', nargs='?', default='corner_only_data.json')
+    parser.add_argument('--window', type=int, default=10, help='滚动窗口（比赛分钟）')
+    parser.add_argument('--min-corners', type=int, default=3, help='热门比赛阈值')
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    analytics = CornerAnalytics(window=args.window)
+    analytics.backfill(data.get('matches', data))
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 回填完成: {len(analytics.matches)} 场比赛")
+    print(json.dumps(analytics.summary(), ensure_ascii=False, indent=2))
+    print(f"\n近{args.window}分钟角球 ≥ {args.min_corners} 的比赛: {analytics.hot_matches(args.min_corners)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,155 +1,562 @@
+from __future__ import annotations
+
 import asyncio
-from playwright.async_api import async_playwright, Page
+import heapq
 from datetime import datetime
 import json
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 import os
 import re
+import socket
+import time
+from urllib.parse import urlparse
+
+from corner_analytics import CornerAnalytics
+
+# playwright 导入较慢，只在启动浏览器时加载
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+STARTUP_T0 = time.perf_counter()
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-infobars',
+    '--window-position=0,0',
+    '--ignore-certificate-errors',
+    '--ignore-certificate-errors-spki-list',
+    f'--user-agent={USER_AGENT}'
+]
+STEALTH_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => false});
+    window.chrome = {runtime: {}};
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['zh-CN', 'zh']});
+"""
+
+
+def cdp_available(cdp_url: str, timeout: float = 0.3) -> bool:
+    """快速探测 CDP 端口是否有浏览器在监听"""
+    parsed = urlparse(cdp_url)
+    try:
+        with socket.create_connection((parsed.hostname or '127.0.0.1', parsed.port or 9222), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+# 比赛列表解析脚本
+LIVE_LIST_JS = '''() => {
+    const results = [];
+    let rows = document.querySelectorAll('.match, tr[data-mid], table tr[data-mid], .live-item, .game-row');
+    if (rows.length === 0) {
+        rows = document.querySelectorAll('tr');
+    }
+
+    rows.forEach((row, index) => {
+        try {
+            const tds = row.querySelectorAll('td, div');
+            if (tds.length < 4) return;
+
+            let status = '';
+            let home = '';
+            let away = '';
+            let score = '';
+            let href = '';
+
+            const statusPatterns = ['上半场', '下半场', '中场', '完场', '加时', '点球', '未开'];
+            const timePattern = /^\\d+\\s*['′′]\\s*$/;
+            const scorePattern = /^\\d+\\s*[:：]\\s*\\d+$/;
+
+            for (let i = 0; i < tds.length; i++) {
+                const text = tds[i].innerText.trim();
+                if (statusPatterns.some(p => text.includes(p)) || timePattern.test(text)) {
+                    status = text;
+                }
+                if (scorePattern.test(text.replace(/\\s/g, ''))) {
+                    score = text;
+                }
+            }
+
+            const links = row.querySelectorAll('a[href*="/live/"]');
+            for (const link of links) {
+                const h = link.getAttribute('href');
+                if (h && h.includes('/live/') && !h.includes('odds')) {
+                    href = h;
+                    const linkText = link.innerText.trim();
+                    if (linkText && linkText.length > 1 && !scorePattern.test(linkText)) {
+                        if (!home) home = linkText;
+                        else if (!away && linkText !== home) away = linkText;
+                    }
+                }
+            }
+
+            if (!home || !away) {
+                for (let i = 0; i < tds.length; i++) {
+                    const text = tds[i].innerText.trim();
+                    if (text.length > 1 && text.length < 40 &&
+                        !statusPatterns.some(p => text.includes(p)) &&
+                        !timePattern.test(text) &&
+                        !scorePattern.test(text.replace(/\\s/g, '')) &&
+                        !/^\\d{1,2}:\\d{2}$/.test(text) &&
+                        text !== 'VS') {
+                        if (!home) home = text;
+                        else if (!away && text !== home) away = text;
+                    }
+                }
+            }
+
+            // 联赛名：优先带 league 类名的元素，否则取不含链接的非状态/比分/队名单元格
+            let league = '';
+            const leagueElem = row.querySelector('[class*="league"], .lname');
+            if (leagueElem) {
+                league = leagueElem.innerText.trim();
+            } else {
+                for (let i = 0; i < tds.length; i++) {
+                    const text = tds[i].innerText.trim();
+                    if (text.length > 1 && text.length < 20 &&
+                        !tds[i].querySelector('a') &&
+                        text !== home && text !== away && text !== 'VS' &&
+                        !statusPatterns.some(p => text.includes(p)) &&
+                        !timePattern.test(text) &&
+                        !scorePattern.test(text.replace(/\\s/g, '')) &&
+                        !/^\\d{1,2}:\\d{2}$/.test(text)) {
+                        league = text;
+                        break;
+                    }
+                }
+            }
+
+            if (href && home && away) {
+                results.push({
+                    index: index,
+                    status: status,
+                    home: home,
+                    away: away,
+                    score: score,
+                    league: league,
+                    href: href
+                });
+            }
+        } catch (e) {}
+    });
+    return results;
+}'''
+
+# 页面提取脚本（单独提取和轮询模式的合并提取共用）
+TEAM_INFO_JS = '''() => {
+    let home = '', away = '', score = '', status = '';
+
+    const scoreSelectors = ['.score', '[class*="score"]', '.match-score', '.live-score'];
+    for (const sel of scoreSelectors) {
+        const elem = document.querySelector(sel);
+        if (elem) {
+            const text = elem.innerText.trim();
+            if (/^\\d+\\s*[:：]\\s*\\d+$/.test(text.replace(/\\s/g, ''))) {
+                score = text;
+                const parent = elem.closest('div, .match-info, .header');
+                if (parent) {
+                    const texts = parent.innerText.split('\\n').map(t => t.trim()).filter(t => t);
+                    for (const t of texts) {
+                        if (t.length > 1 && t.length < 30 && !/\\d+[:：]\\d+/.test(t) && !/^\\d+['′′]$/.test(t)) {
+                            if (!home) home = t;
+                            else if (!away && t !== home) away = t;
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    const homeElems = document.querySelectorAll('[class*="home"], [class*="left"], [class*="host"], [class*="主队"]');
+    const awayElems = document.querySelectorAll('[class*="away"], [class*="right"], [class*="guest"], [class*="客队"]');
+
+    for (const el of homeElems) {
+        const text = el.innerText.trim();
+        if (text && text.length > 1 && text.length < 30 && !/\\d+[:：]\\d+/.test(text)) {
+            if (!home) home = text.split('\\n')[0];
+        }
+    }
+    for (const el of awayElems) {
+        const text = el.innerText.trim();
+        if (text && text.length > 1 && text.length < 30 && !/\\d+[:：]\\d+/.test(text)) {
+            if (!away) away = text.split('\\n')[0];
+        }
+    }
+
+    const timeElems = document.querySelectorAll('span, div');
+    for (const el of timeElems) {
+        const text = el.innerText.trim();
+        if (/^\\d+['′′]$/.test(text)) {
+            status = text;
+            break;
+        }
+    }
+    if (document.body.innerText.includes('中场')) status = '中场';
+
+    return { home, away, score: score || '', status: status || '' };
+}'''
+
+CORNER_EVENTS_JS = '''() => {
+    const cornerEvents = [];
+    const seen = new Set();
+
+    // 🔴 策略1：优先提取 img.corner_tips 的 title 属性
+    const cornerImgs = document.querySelectorAll('img.corner_tips, img[class*="corner"]');
+    for (const img of cornerImgs) {
+        const title = img.getAttribute('title');
+        if (title && title.includes('角球')) {
+            const normalized = title.trim();
+            if (normalized.length < 200 && !seen.has(normalized)) {
+                seen.add(normalized);
+                cornerEvents.push(normalized);
+            }
+        }
+    }
+
+    // 策略2：从事件容器中提取
+    const containerSelectors = [
+        '.event-list', '.timeline', '[class*="event"]', '[class*="live-animation"]',
+        '#animation', '.match-events', '.live-text', 'div[class*="text"]',
+        '.tips_panel', 'div[class*="tips"]'
+    ];
+
+    let container = null;
+    for (const sel of containerSelectors) {
+        container = document.querySelector(sel);
+        if (container) break;
+    }
+    if (!container) container = document.body;
+
+    const rows = container.querySelectorAll('div, li, p, span, tr');
+
+    let currentTime = '';
+    for (const row of rows) {
+        const text = row.innerText.trim();
+        if (!text) continue;
+
+        if (/^\\d+['′′′]$/.test(text)) {
+            currentTime = text;
+            continue;
+        }
+
+        if (text.includes('角球') && (text.includes('获得') || text.includes('角球'))) {
+            let fullEvent = text;
+            if (currentTime) {
+                fullEvent = currentTime + ' ' + text;
+                currentTime = '';
+            } else if (/^\\d+['′′′]/.test(text.substring(0, 6))) {
+                fullEvent = text;
+            }
+
+            const normalized = fullEvent.trim();
+            if (normalized.length < 200 && !seen.has(normalized)) {
+                seen.add(normalized);
+                cornerEvents.push(normalized);
+            }
+        }
+
+        if (text.length > 100) {
+            currentTime = '';
+        }
+    }
+
+    // 策略3：查找包含"角球"的所有元素
+    const cornerElems = container.querySelectorAll('*');
+    for (const elem of cornerElems) {
+        const text = elem.innerText.trim();
+        if (text.includes('角球') && text.includes('获得') && text.length < 200) {
+            let full = text;
+            if (elem.previousElementSibling) {
+                const prevText = elem.previousElementSibling.innerText.trim();
+                if (/^\\d+['′′′]$/.test(prevText)) {
+                    full = prevText + ' ' + text;
+                }
+            }
+            const normalized = full.trim();
+            if (!seen.has(normalized)) {
+                seen.add(normalized);
+                cornerEvents.push(normalized);
+            }
+        }
+    }
+
+    // 🔴 策略4：查找所有带 title 属性且包含"角球"的元素
+    const allWithTitle = document.querySelectorAll('[title]');
+    for (const elem of allWithTitle) {
+        const title = elem.getAttribute('title');
+        if (title && title.includes('角球')) {
+            const normalized = title.trim();
+            if (normalized.length < 200 && !seen.has(normalized)) {
+                seen.add(normalized);
+                cornerEvents.push(normalized);
+            }
+        }
+    }
+
+    return cornerEvents;
+}'''
+
+ALL_EVENTS_JS = '''() => {
+    const allEvents = [];
+    const seen = new Set();
+
+    // 🔴 新增：提取所有带 title 的图片元素
+    const allImgs = document.querySelectorAll('img[title]');
+    for (const img of allImgs) {
+        const title = img.getAttribute('title');
+        if (title && title.length > 3 && title.length < 200) {
+            const normalized = title.trim();
+            if (!seen.has(normalized)) {
+                seen.add(normalized);
+                allEvents.push(normalized);
+            }
+        }
+    }
+
+    const containerSelectors = [
+        '.event-list', '.timeline', '[class*="event"]', '[class*="live-animation"]',
+        '#animation', '.match-events', '.live-text', 'div[class*="text"]'
+    ];
+
+    let container = null;
+    for (const sel of containerSelectors) {
+        container = document.querySelector(sel);
+        if (container) break;
+    }
+    if (!container) container = document.body;
+
+    const rows = container.querySelectorAll('div, li, p, span, tr');
+
+    let currentTime = '';
+    for (const row of rows) {
+        const text = row.innerText.trim();
+        if (!text) continue;
+
+        if (/^\\d+['′′′]$/.test(text)) {
+            currentTime = text;
+            continue;
+        }
+
+        if (text.length > 3 && text.length < 200 &&
+            (text.includes('球') || text.includes('进球') || text.includes('角球') ||
+             text.includes('黄牌') || text.includes('红牌') || text.includes('换人'))) {
+            let fullEvent = text;
+            if (currentTime) {
+                fullEvent = currentTime + ' ' + text;
+                currentTime = '';
+            } else if (/^\\d+['′′′]/.test(text.substring(0, 6))) {
+                fullEvent = text;
+            }
+
+            const normalized = fullEvent.trim();
+            if (!seen.has(normalized)) {
+                seen.add(normalized);
+                allEvents.push(normalized);
+            }
+        }
+
+        if (text.length > 100) {
+            currentTime = '';
+        }
+    }
+
+    return allEvents;
+}'''
+
+# 比赛页切换到事件面板的标签
+LIVE_TABS = ['动画直播', '直播数据', '动画', '技术统计', '文字直播']
+
+# 事件区域已渲染出内容（而不仅是空容器）
+EVENTS_READY_SELECTOR = (
+    'img.corner_tips, .timeline > *, .event-list > *, .match-events > *, '
+    '#animation > *, .live-text > *, [class*="event"] > *'
+)
+
+# 是否存在事件/动画直播区域
+EVENT_AREA_JS = '''() => {
+    const selectors = [
+        '[class*="event"]', '[class*="live-animation"]', '[class*="timeline"]',
+        '.event-list', '.animation', '#animation', '[id*="live"]',
+        '.corner_tips', 'img.corner_tips'
+    ];
+    for (const sel of selectors) {
+        if (document.querySelector(sel)) return true;
+    }
+    return document.body.innerText.includes('角球') ||
+           document.body.innerText.includes('获得角球') ||
+           document.body.innerText.includes('上半场') ||
+           document.body.innerText.includes('下半场');
+}'''
+
+# 比赛状态显示为"完场"（只看叶子元素的完整文本，避免匹配到"完场比分"之类的导航）
+FINISHED_JS = '''() => Array.from(document.querySelectorAll('span, div, em, b, td, p'))
+    .some(el => el.children.length === 0 && el.innerText.trim() === '完场')'''
+
+# 一次 evaluate 完成比分、角球、所有事件、事件区域和完场状态的提取
+SWEEP_EXTRACT_JS = f'''() => ({{
+    info: ({TEAM_INFO_JS})(),
+    corners: ({CORNER_EVENTS_JS})(),
+    events: ({ALL_EVENTS_JS})(),
+    has_event: ({EVENT_AREA_JS})(),
+    finished: ({FINISHED_JS})()
+}})'''
 
 
 class CornerKickScraper:
-    def __init__(self):
-        # 基础配置
-        self.base_url = "https://www.599.com"
+    def __init__(self, base_url: str = None):
+        # 基础配置（可通过 CORNOE_BASE_URL 指向本地模拟站点 replay_server.py）
+        self.base_url = (base_url or os.environ.get('CORNOE_BASE_URL') or "https://www.599.com").rstrip('/')
         self.corner_data = {}
         self.corner_only_data = {}
         self.corner_file = 'corner_only_data.json'
+        self.analytics = CornerAnalytics(window=10)
+        self.hot_corner_threshold = 3
         self.browser = None
         self.context = None
+        # 启动配置（均需显式开启）：CORNOE_CDP_URL 连接已运行的浏览器，
+        # CORNOE_USER_DATA_DIR 使用带缓存的持久化 profile；都未设置时全新启动
+        self.cdp_url = os.environ.get('CORNOE_CDP_URL') or None
+        self.user_data_dir = os.environ.get('CORNOE_USER_DATA_DIR') or None
+        self.viewport = {'width': 800, 'height': 600}
+        self.browser_mode = None
+        self.prewarm_count = 2
+        self.list_ready_timeout = 8
+        self.page_pool = []
+        self.startup_marks = {}
         self.monitoring_pages = {}
         self.refresh_interval = 300
         self.close_delay = 200
+        # 轮询模式：超出独立标签页上限的比赛由少量共享标签页轮流刷新
+        self.sweep_mode = os.environ.get('CORNOE_SWEEP', '') not in ('', '0')
+        self.max_dedicated_tabs = 10
+        self.sweep_tabs = 3
+        self.sweep_freshness = 60
+        self.sweep_hot_freshness = 20
+        self.sweep_freshness_by_match = {}
+        self.sweep_matches = {}
+        self.sweep_queue = []
+        self.sweep_pages = []
+        self.sweep_tasks = []
+        self.sweep_ready_timeout = 3000
+
+    def context_options(self) -> Dict:
+        """浏览器上下文参数（最小视口）"""
+        return {
+            'viewport': self.viewport,
+            'user_agent': USER_AGENT,
+            'locale': 'zh-CN',
+            'timezone_id': 'Asia/Shanghai'
+        }
 
     async def init_browser(self, headless=True):
-        """初始化浏览器（添加反检测参数）"""
+        """初始化浏览器：优先复用已运行的浏览器（CDP），其次持久化 profile，最后全新启动"""
+        from playwright.async_api import async_playwright
+
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=headless,
-            args=[
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-infobars',
-                '--window-position=0,0',
-                '--ignore-certificate-errors',
-                '--ignore-certificate-errors-spki-list',
-                '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            ]
-        )
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            locale='zh-CN',
-            timezone_id='Asia/Shanghai',
-            permissions=['geolocation']
-        )
-        await self.context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {get: () => false});
-            window.chrome = {runtime: {}};
-            Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3]});
-            Object.defineProperty(navigator, 'languages', {get: () => ['zh-CN', 'zh']});
-        """)
-        print("✓ 浏览器已启动（无头模式）")
+
+        if self.cdp_url and cdp_available(self.cdp_url):
+            try:
+                self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_url)
+                # 每次运行使用独立上下文：退出时关闭；进程崩溃断开连接时浏览器也会随之回收，
+                # 不会在常驻浏览器里留下仍在轮询的标签页
+                self.context = await self.browser.new_context(**self.context_options())
+                self.browser_mode = 'cdp'
+            except Exception as e:
+                print(f"连接已有浏览器失败，改为本地启动: {e}")
+                self.browser = None
+
+        if self.browser_mode != 'cdp' and self.user_data_dir:
+            try:
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    self.user_data_dir, headless=headless, args=BROWSER_ARGS, **self.context_options()
+                )
+                self.browser_mode = 'persistent'
+            except Exception as e:
+                # profile 可能被常驻浏览器或另一个监控进程占用
+                print(f"持久化 profile 启动失败，改为全新启动: {e}")
+
+        if self.browser_mode is None:
+            self.browser = await self.playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+            self.context = await self.browser.new_context(**self.context_options())
+            self.browser_mode = 'launch'
+
+        await self.context.add_init_script(STEALTH_JS)
+        self.mark_startup('browser_ready')
+        print(f"✓ 浏览器已就绪（{self.browser_mode}）")
+
+    async def prewarm_pages(self):
+        """与首次扫描并行预开标签页，监控启动时直接取用"""
+        for _ in range(self.prewarm_count):
+            try:
+                self.page_pool.append(await self.context.new_page())
+            except Exception as e:
+                print(f"预开标签页失败: {e}")
+                break
+
+    async def take_page(self) -> Page:
+        """优先使用预开的标签页"""
+        if self.page_pool:
+            return self.page_pool.pop()
+        return await self.context.new_page()
+
+    def mark_startup(self, name: str):
+        """记录启动阶段耗时（只记第一次），首场比赛数据到达时输出报告"""
+        if name in self.startup_marks:
+            return
+        self.startup_marks[name] = time.perf_counter() - STARTUP_T0
+        if name == 'first_match':
+            print(f"⏱ {self.startup_report()}")
+
+    def startup_report(self) -> str:
+        labels = [('browser_ready', '浏览器就绪'), ('first_scan', '首次扫描'), ('first_match', '首场比赛数据')]
+        parts = [f"{label} {self.startup_marks[key]:.1f}s" for key, label in labels if key in self.startup_marks]
+        return f"启动耗时 ({self.browser_mode}): " + ' | '.join(parts)
 
     async def close_browser(self):
         """优雅关闭所有页面和浏览器"""
-        for page in self.monitoring_pages.values():
+        for task in self.sweep_tasks:
+            task.cancel()
+        for page in list(self.monitoring_pages.values()) + self.sweep_pages + self.page_pool:
             try:
                 await page.close()
             except:
                 pass
+        self.monitoring_pages.clear()
+        self.sweep_pages = []
+        self.page_pool = []
 
+        # 关闭本次运行的上下文；CDP 连接的浏览器只断开，不关闭，下次启动直接复用
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
+            del self.playwright
+        self.context = None
+        self.browser = None
 
 
-async def get_live_matches(self) -> List[Dict]:
+    async def get_live_matches(self) -> List[Dict]:
         """获取进行中的比赛列表（排除未开）"""
         page = await self.context.new_page()
 
         try:
             print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 正在扫描比赛列表...")
             await page.goto(f"{self.base_url}/live/", wait_until='domcontentloaded', timeout=60000)
-            await asyncio.sleep(4)
-
-            matches_data = await page.evaluate('''() => {
-                const results = [];
-                let rows = document.querySelectorAll('.match, tr[data-mid], table tr[data-mid], .live-item, .game-row');
-                if (rows.length === 0) {
-                    rows = document.querySelectorAll('tr');
-                }
 
-                rows.forEach((row, index) => {
-                    try {
-                        const tds = row.querySelectorAll('td, div');
-                        if (tds.length < 4) return;
-
-                        let status = '';
-                        let home = '';
-                        let away = '';
-                        let score = '';
-                        let href = '';
-
-                        const statusPatterns = ['上半场', '下半场', '中场', '完场', '加时', '点球', '未开'];
-                        const timePattern = /^\\d+\\s*['′′]\\s*$/;
-                        const scorePattern = /^\\d+\\s*[:：]\\s*\\d+$/;
-
-                        for (let i = 0; i < tds.length; i++) {
-                            const text = tds[i].innerText.trim();
-                            if (statusPatterns.some(p => text.includes(p)) || timePattern.test(text)) {
-                                status = text;
-                            }
-                            if (scorePattern.test(text.replace(/\\s/g, ''))) {
-                                score = text;
-                            }
-                        }
-
-                        const links = row.querySelectorAll('a[href*="/live/"]');
-                        for (const link of links) {
-                            const h = link.getAttribute('href');
-                            if (h && h.includes('/live/') && !h.includes('odds')) {
-                                href = h;
-                                const linkText = link.innerText.trim();
-                                if (linkText && linkText.length > 1 && !scorePattern.test(linkText)) {
-                                    if (!home) home = linkText;
-                                    else if (!away && linkText !== home) away = linkText;
-                                }
-                            }
-                        }
-
-                        if (!home || !away) {
-                            for (let i = 0; i < tds.length; i++) {
-                                const text = tds[i].innerText.trim();
-                                if (text.length > 1 && text.length < 40 &&
-                                    !statusPatterns.some(p => text.includes(p)) &&
-                                    !timePattern.test(text) &&
-                                    !scorePattern.test(text.replace(/\\s/g, '')) &&
-                                    !/^\\d{1,2}:\\d{2}$/.test(text) &&
-                                    text !== 'VS') {
-                                    if (!home) home = text;
-                                    else if (!away && text !== home) away = text;
-                                }
-                            }
-                        }
-
-                        if (href && home && away) {
-                            results.push({
-                                index: index,
-                                status: status,
-                                home: home,
-                                away: away,
-                                score: score,
-                                href: href
-                            });
-                        }
-                    } catch (e) {}
-                });
-                return results;
-            }''')
+            # 轮询解析直到出现比赛行，列表渲染完成即继续（最多 list_ready_timeout 秒）
+            loop = asyncio.get_event_loop()
+            deadline = loop.time() + self.list_ready_timeout
+            while True:
+                matches_data = await page.evaluate(LIVE_LIST_JS)
+                if matches_data or loop.time() >= deadline:
+                    break
+                await asyncio.sleep(0.5)
 
             print(f"页面共找到 {len(matches_data)} 场比赛")
             matches = []
@@ -167,7 +574,8 @@ async def get_live_matches(self) -> List[Dict]:
                     'home': data['home'],
                     'away': data['away'],
                     'score': data['score'] or '0:0',
-                    'status': data['status'] or '进行中'
+                    'status': data['status'] or '进行中',
+                    'league': data.get('league', '')
                 }
 
                 matches.append(match_info)
@@ -181,191 +589,33 @@ async def get_live_matches(self) -> List[Dict]:
             await page.close()
             return []
 
-    async def check_target_element_exists(self, page: Page) -> bool:
-        """检查是否存在事件/动画直播区域"""
+    async def check_target_element_exists(self, page: Page, wait: bool = True) -> bool:
+        """检查是否存在事件/动画直播区域（调用方已等待过事件内容时传 wait=False）"""
         try:
-            await asyncio.sleep(2)
-            has_event = await page.evaluate('''() => {
-                const selectors = [
-                    '[class*="event"]', '[class*="live-animation"]', '[class*="timeline"]',
-                    '.event-list', '.animation', '#animation', '[id*="live"]',
-                    '.corner_tips', 'img.corner_tips'
-                ];
-                for (const sel of selectors) {
-                    if (document.querySelector(sel)) return true;
-                }
-                return document.body.innerText.includes('角球') ||
-                       document.body.innerText.includes('获得角球') ||
-                       document.body.innerText.includes('上半场') ||
-                       document.body.innerText.includes('下半场');
-            }''')
+            if wait:
+                try:
+                    await page.wait_for_selector(EVENTS_READY_SELECTOR, timeout=2000)
+                except Exception:
+                    pass
+            has_event = await page.evaluate(EVENT_AREA_JS)
             return has_event
         except:
             return False
 
 
-async def extract_team_names_and_score_dom(self, page: Page) -> Dict:
+    async def extract_team_names_and_score_dom(self, page: Page) -> Dict:
         """通过DOM方式提取队伍名和比分（多策略fallback）"""
         try:
-            info = await page.evaluate('''() => {
-                let home = '', away = '', score = '', status = '';
-
-                const scoreSelectors = ['.score', '[class*="score"]', '.match-score', '.live-score'];
-                for (const sel of scoreSelectors) {
-                    const elem = document.querySelector(sel);
-                    if (elem) {
-                        const text = elem.innerText.trim();
-                        if (/^\\d+\\s*[:：]\\s*\\d+$/.test(text.replace(/\\s/g, ''))) {
-                            score = text;
-                            const parent = elem.closest('div, .match-info, .header');
-                            if (parent) {
-                                const texts = parent.innerText.split('\\n').map(t => t.trim()).filter(t => t);
-                                for (const t of texts) {
-                                    if (t.length > 1 && t.length < 30 && !/\\d+[:：]\\d+/.test(t) && !/^\\d+['′′]$/.test(t)) {
-                                        if (!home) home = t;
-                                        else if (!away && t !== home) away = t;
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-
-                const homeElems = document.querySelectorAll('[class*="home"], [class*="left"], [class*="host"], [class*="主队"]');
-                const awayElems = document.querySelectorAll('[class*="away"], [class*="right"], [class*="guest"], [class*="客队"]');
-
-                for (const el of homeElems) {
-                    const text = el.innerText.trim();
-                    if (text && text.length > 1 && text.length < 30 && !/\\d+[:：]\\d+/.test(text)) {
-                        if (!home) home = text.split('\\n')[0];
-                    }
-                }
-                for (const el of awayElems) {
-                    const text = el.innerText.trim();
-                    if (text && text.length > 1 && text.length < 30 && !/\\d+[:：]\\d+/.test(text)) {
-                        if (!away) away = text.split('\\n')[0];
-                    }
-                }
-
-                const timeElems = document.querySelectorAll('span, div');
-                for (const el of timeElems) {
-                    const text = el.innerText.trim();
-                    if (/^\\d+['′′]$/.test(text)) {
-                        status = text;
-                        break;
-                    }
-                }
-                if (document.body.innerText.includes('中场')) status = '中场';
-
-                return { home, away, score: score || '', status: status || '' };
-            }''')
+            info = await page.evaluate(TEAM_INFO_JS)
             return info
         except:
             return {'home': '', 'away': '', 'score': '', 'status': ''}
 
 
-async def extract_corner_events_dom(self, page: Page) -> List[str]:
+    async def extract_corner_events_dom(self, page: Page) -> List[str]:
         """使用DOM方式精确提取角球事件 - 增强版（支持img.corner_tips）"""
         try:
-            events = await page.evaluate('''() => {
-                const cornerEvents = [];
-                const seen = new Set();
-
-                // 🔴 策略1：优先提取 img.corner_tips 的 title 属性
-                const cornerImgs = document.querySelectorAll('img.corner_tips, img[class*="corner"]');
-                for (const img of cornerImgs) {
-                    const title = img.getAttribute('title');
-                    if (title && title.includes('角球')) {
-                        const normalized = title.trim();
-                        if (normalized.length < 200 && !seen.has(normalized)) {
-                            seen.add(normalized);
-                            cornerEvents.push(normalized);
-                        }
-                    }
-                }
-
-                // 策略2：从事件容器中提取
-                const containerSelectors = [
-                    '.event-list', '.timeline', '[class*="event"]', '[class*="live-animation"]',
-                    '#animation', '.match-events', '.live-text', 'div[class*="text"]',
-                    '.tips_panel', 'div[class*="tips"]'
-                ];
-
-                let container = null;
-                for (const sel of containerSelectors) {
-                    container = document.querySelector(sel);
-                    if (container) break;
-                }
-                if (!container) container = document.body;
-
-                const rows = container.querySelectorAll('div, li, p, span, tr');
-
-                let currentTime = '';
-                for (const row of rows) {
-                    const text = row.innerText.trim();
-                    if (!text) continue;
-
-                    if (/^\\d+['′′′]$/.test(text)) {
-                        currentTime = text;
-                        continue;
-                    }
-
-                    if (text.includes('角球') && (text.includes('获得') || text.includes('角球'))) {
-                        let fullEvent = text;
-                        if (currentTime) {
-                            fullEvent = currentTime + ' ' + text;
-                            currentTime = '';
-                        } else if (/^\\d+['′′′]/.test(text.substring(0, 6))) {
-                            fullEvent = text;
-                        }
-
-                        const normalized = fullEvent.trim();
-                        if (normalized.length < 200 && !seen.has(normalized)) {
-                            seen.add(normalized);
-                            cornerEvents.push(normalized);
-                        }
-                    }
-
-                    if (text.length > 100) {
-                        currentTime = '';
-                    }
-                }
-
-                // 策略3：查找包含"角球"的所有元素
-                const cornerElems = container.querySelectorAll('*');
-                for (const elem of cornerElems) {
-                    const text = elem.innerText.trim();
-                    if (text.includes('角球') && text.includes('获得') && text.length < 200) {
-                        let full = text;
-                        if (elem.previousElementSibling) {
-                            const prevText = elem.previousElementSibling.innerText.trim();
-                            if (/^\\d+['′′′]$/.test(prevText)) {
-                                full = prevText + ' ' + text;
-                            }
-                        }
-                        const normalized = full.trim();
-                        if (!seen.has(normalized)) {
-                            seen.add(normalized);
-                            cornerEvents.push(normalized);
-                        }
-                    }
-                }
-
-                // 🔴 策略4：查找所有带 title 属性且包含"角球"的元素
-                const allWithTitle = document.querySelectorAll('[title]');
-                for (const elem of allWithTitle) {
-                    const title = elem.getAttribute('title');
-                    if (title && title.includes('角球')) {
-                        const normalized = title.trim();
-                        if (normalized.length < 200 && !seen.has(normalized)) {
-                            seen.add(normalized);
-                            cornerEvents.push(normalized);
-                        }
-                    }
-                }
-
-                return cornerEvents;
-            }''')
+            events = await page.evaluate(CORNER_EVENTS_JS)
             
             if events:
                 print(f"  提取到 {len(events)} 个角球事件")
@@ -375,82 +625,17 @@ async def extract_corner_events_dom(self, page: Page) -> List[str]:
             return []
 
 
-async def extract_all_events_dom(self, page: Page) -> List[str]:
+    async def extract_all_events_dom(self, page: Page) -> List[str]:
         """使用DOM方式提取所有事件"""
         try:
-            events = await page.evaluate('''() => {
-                const allEvents = [];
-                const seen = new Set();
-
-                // 🔴 新增：提取所有带 title 的图片元素
-                const allImgs = document.querySelectorAll('img[title]');
-                for (const img of allImgs) {
-                    const title = img.getAttribute('title');
-                    if (title && title.length > 3 && title.length < 200) {
-                        const normalized = title.trim();
-                        if (!seen.has(normalized)) {
-                            seen.add(normalized);
-                            allEvents.push(normalized);
-                        }
-                    }
-                }
-
-                const containerSelectors = [
-                    '.event-list', '.timeline', '[class*="event"]', '[class*="live-animation"]',
-                    '#animation', '.match-events', '.live-text', 'div[class*="text"]'
-                ];
-
-                let container = null;
-                for (const sel of containerSelectors) {
-                    container = document.querySelector(sel);
-                    if (container) break;
-                }
-                if (!container) container = document.body;
-
-                const rows = container.querySelectorAll('div, li, p, span, tr');
-
-                let currentTime = '';
-                for (const row of rows) {
-                    const text = row.innerText.trim();
-                    if (!text) continue;
-
-                    if (/^\\d+['′′′]$/.test(text)) {
-                        currentTime = text;
-                        continue;
-                    }
-
-                    if (text.length > 3 && text.length < 200 &&
-                        (text.includes('球') || text.includes('进球') || text.includes('角球') ||
-                         text.includes('黄牌') || text.includes('红牌') || text.includes('换人'))) {
-                        let fullEvent = text;
-                        if (currentTime) {
-                            fullEvent = currentTime + ' ' + text;
-                            currentTime = '';
-                        } else if (/^\\d+['′′′]/.test(text.substring(0, 6))) {
-                            fullEvent = text;
-                        }
-
-                        const normalized = fullEvent.trim();
-                        if (!seen.has(normalized)) {
-                            seen.add(normalized);
-                            allEvents.push(normalized);
-                        }
-                    }
-
-                    if (text.length > 100) {
-                        currentTime = '';
-                    }
-                }
-
-                return allEvents;
-            }''')
+            events = await page.evaluate(ALL_EVENTS_JS)
             return events
         except Exception as e:
             print(f"DOM提取所有事件出错: {e}")
             return []
 
 
-def save_corner_data(self):
+    def save_corner_data(self):
         """保存角球专用数据到JSON"""
         try:
             output_data = {
@@ -460,24 +645,17 @@ def save_corner_data(self):
                 'matches': {}
             }
 
-            total_corners = 0
+            # 统计由 analytics 增量维护，这里只读取
             for match_id, data in self.corner_only_data.items():
-                corners = data.get('corners', [])
-                home_corners = len([c for c in corners if '主队' in c or 'home' in c.lower() or '主' in c])
-                away_corners = len([c for c in corners if '客队' in c or 'away' in c.lower() or '客' in c])
-
                 output_data['matches'][match_id] = {
                     'match_info': data['match_info'],
-                    'stats': {
-                        'total': len(corners),
-                        'home': home_corners,
-                        'away': away_corners
-                    },
-                    'events': corners
+                    'stats': self.analytics.match_stats(match_id),
+                    'events': data.get('corners', [])
                 }
-                total_corners += len(corners)
 
+            total_corners = self.analytics.total
             output_data['total_corners'] = total_corners
+            output_data['analytics'] = self.analytics.summary()
 
             with open(self.corner_file, 'w', encoding='utf-8') as f:
                 json.dump(output_data, f, ensure_ascii=False, indent=2)
@@ -494,14 +672,19 @@ def save_corner_data(self):
         print("足球角球实时监控系统 (DOM解析版 - 无头模式 - 增强版)".center(130))
         print("="*130)
         print(f"更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if 'first_match' in self.startup_marks:
+            print(self.startup_report())
         print(f"监控比赛数: {len(self.monitoring_pages)} | 角球数据文件: {self.corner_file}")
+        if self.sweep_mode:
+            print(f"轮询比赛数: {len(self.sweep_matches)} | 轮询标签页: {len(self.sweep_pages)}")
         print("="*130)
 
         if not self.corner_data:
             print("暂无数据".center(130))
             return
 
-        header = f"{'ID':<12} {'主队':<25} {'客队':<25} {'比分':<10} {'状态':<10} {'总事件':<8} {'角球数':<8}"
+        window_key = f'last_{self.analytics.window}min'
+        header = f"{'ID':<12} {'主队':<25} {'客队':<25} {'比分':<10} {'状态':<10} {'总事件':<8} {'角球数':<8} {'上/下半':<8} {'近' + str(self.analytics.window) + '分':<8}"
         print(header)
         print("-"*130)
 
@@ -511,17 +694,22 @@ def save_corner_data(self):
             info = data['match_info']
             events = data['events']
             corners = self.corner_only_data.get(match_id, {}).get('corners', [])
+            stats = self.analytics.match_stats(match_id)
 
             home = info['home'][:23]
             away = info['away'][:23]
+            halves = f"{stats['first_half']}/{stats['second_half']}"
 
-            print(f"{match_id:<12} {home:<25} {away:<25} {info['score']:<10} {info['status']:<10} {len(events):<8} {len(corners):<8}")
+            print(f"{match_id:<12} {home:<25} {away:<25} {info['score']:<10} {info['status']:<10} {len(events):<8} {len(corners):<8} {halves:<8} {stats[window_key]:<8}")
 
             total_events += len(events)
             total_corners += len(corners)
 
         print("-"*130)
         print(f"总计: {len(self.corner_data)} 场比赛 | {total_events} 总事件 | {total_corners} 总角球")
+        hot = self.analytics.hot_matches(self.hot_corner_threshold)
+        if hot:
+            print(f"🔥 近{self.analytics.window}分钟角球 ≥ {self.hot_corner_threshold}: {', '.join(hot)}")
         print("="*130)
 
         if total_corners > 0:
@@ -536,34 +724,43 @@ def save_corner_data(self):
                         print(f"  {i:>2}. {event}")
 
 
-async def monitor_single_match(self, match_info: Dict):
+    async def monitor_single_match(self, match_info: Dict):
         """监控单场比赛 - 增强版"""
         match_id = match_info['id']
         page = None
 
         try:
-            page = await self.context.new_page()
+            page = await self.take_page()
             self.monitoring_pages[match_id] = page
 
             print(f"[{match_id}] 启动监控: {match_info['home']} vs {match_info['away']}")
 
             await page.goto(match_info['url'], wait_until='domcontentloaded', timeout=60000)
-            await asyncio.sleep(5)  # 🔴 增加等待时间，确保页面完全加载
 
-            # 尝试点击进入动画直播
+            # 等到事件内容或切换标签出现（最多5s），代替固定等待
+            try:
+                await page.wait_for_function(
+                    '([sel, tabs]) => document.querySelector(sel) || '
+                    '(document.body && tabs.some(t => document.body.innerText.includes(t)))',
+                    arg=[EVENTS_READY_SELECTOR, LIVE_TABS], timeout=5000
+                )
+            except Exception:
+                pass
+
+            # 尝试点击进入动画直播，点击后等事件内容渲染
             clicked = False
-            for text in ['动画直播', '直播数据', '动画', '技术统计', '文字直播']:
+            for text in LIVE_TABS:
                 try:
-                    await page.click(f'text={text}', timeout=5000)
-                    await asyncio.sleep(3)
+                    await page.click(f'text={text}', timeout=1000)
                     clicked = True
                     print(f"[{match_id}] 已进入 {text}")
                     break
                 except:
                     continue
-
-            # 🔴 额外等待，确保动画元素加载
-            await asyncio.sleep(3)
+            try:
+                await page.wait_for_selector(EVENTS_READY_SELECTOR, timeout=3000)
+            except Exception:
+                pass
 
             # 更新队伍信息
             dom_info = await self.extract_team_names_and_score_dom(page)
@@ -572,7 +769,7 @@ async def monitor_single_match(self, match_info: Dict):
                     match_info[key] = dom_info[key]
 
             # 检查是否有事件区域
-            if not await self.check_target_element_exists(page):
+            if not await self.check_target_element_exists(page, wait=False):
                 print(f"[{match_id}] 无事件区域，{self.close_delay}s后关闭")
                 await asyncio.sleep(self.close_delay)
                 return
@@ -591,10 +788,6 @@ async def monitor_single_match(self, match_info: Dict):
                 try:
                     # 更新比分和状态
                     dom_info = await self.extract_team_names_and_score_dom(page)
-                    for key in ['home', 'away', 'score', 'status']:
-                        if dom_info.get(key):
-                            self.corner_data[match_id]['match_info'][key] = dom_info[key]
-                            self.corner_only_data[match_id]['match_info'][key] = dom_info[key]
 
                     # 0:0 检测
                     current_score = dom_info.get('score', '') or match_info['score']
@@ -611,16 +804,8 @@ async def monitor_single_match(self, match_info: Dict):
                     # 🔴 提取事件（优先角球）
                     corner_events = await self.extract_corner_events_dom(page)
                     all_events = await self.extract_all_events_dom(page)
-
-                    # 更新角球事件
-                    existing_corners = self.corner_only_data[match_id]['corners']
-                    new_corners = [c for c in corner_events if c not in existing_corners]
-                    existing_corners.extend(new_corners)
-
-                    # 更新所有事件
-                    existing_all = self.corner_data[match_id]['events']
-                    new_all = [e for e in all_events if e not in existing_all]
-                    existing_all.extend(new_all)
+                    new_corners, new_all = self.merge_match_state(match_id, dom_info, corner_events, all_events)
+                    self.mark_startup('first_match')
 
                     # 🔴 有新角球时立即保存并打印
                     if new_corners:
@@ -661,45 +846,225 @@ async def monitor_single_match(self, match_info: Dict):
                     pass
             if match_id in self.monitoring_pages:
                 del self.monitoring_pages[match_id]
+            self.analytics.finish_match(match_id)
+
+    def merge_match_state(self, match_id: str, dom_info: Dict, corner_events: List[str], all_events: List[str]):
+        """把一次提取结果合并进比赛状态，返回 (新增角球, 新增事件)"""
+        for key in ['home', 'away', 'score', 'status']:
+            if dom_info.get(key):
+                self.corner_data[match_id]['match_info'][key] = dom_info[key]
+                self.corner_only_data[match_id]['match_info'][key] = dom_info[key]
+        self.analytics.update_match(match_id, self.corner_only_data[match_id]['match_info'])
+
+        # 更新角球事件
+        existing_corners = self.corner_only_data[match_id]['corners']
+        new_corners = [c for c in corner_events if c not in existing_corners]
+        existing_corners.extend(new_corners)
+        self.analytics.add_corners(match_id, new_corners)
+
+        # 更新所有事件
+        existing_all = self.corner_data[match_id]['events']
+        new_all = [e for e in all_events if e not in existing_all]
+        existing_all.extend(new_all)
+        return new_corners, new_all
+
+    def sweep_freshness_for(self, match_id: str) -> float:
+        """轮询模式下该场比赛的刷新间隔（单独配置 > 近期角球多 > 默认）"""
+        if match_id in self.sweep_freshness_by_match:
+            return self.sweep_freshness_by_match[match_id]
+        if match_id in self.analytics.hot_matches(self.hot_corner_threshold):
+            return self.sweep_hot_freshness
+        return self.sweep_freshness
+
+    def add_sweep_match(self, match_info: Dict):
+        """把比赛加入轮询队列，立即到期"""
+        match_id = match_info['id']
+        self.sweep_matches[match_id] = match_info
+        if match_id not in self.corner_data:
+            self.corner_data[match_id] = {'match_info': match_info.copy(), 'events': []}
+        if match_id not in self.corner_only_data:
+            self.corner_only_data[match_id] = {'match_info': match_info.copy(), 'corners': []}
+        heapq.heappush(self.sweep_queue, (asyncio.get_event_loop().time(), match_id))
+        print(f"[{match_id}] 加入轮询队列: {match_info['home']} vs {match_info['away']}")
+
+    def drop_sweep_match(self, match_id: str, reason: str):
+        """移出轮询队列（队列中的旧条目在出队时跳过）"""
+        if match_id not in self.sweep_matches:
+            return
+        del self.sweep_matches[match_id]
+        self.analytics.finish_match(match_id)
+        print(f"[{match_id}] {reason}，移出轮询队列")
+
+    def refresh_sweep_matches(self, matches: List[Dict]):
+        """重新扫描后同步轮询比赛：更新列表中的比分/状态，移除已不在列表或已完场的比赛"""
+        listed = {m['id']: m for m in matches}
+        for match_id in list(self.sweep_matches):
+            if match_id not in listed:
+                self.drop_sweep_match(match_id, '已不在比赛列表')
+                continue
+            info = listed[match_id]
+            self.merge_match_state(match_id, {'score': info.get('score'), 'status': info.get('status')}, [], [])
+            if '完场' in info.get('status', ''):
+                self.drop_sweep_match(match_id, '比赛已完场')
 
+    def sweep_exit_reason(self, match_info: Dict, result: Dict) -> str:
+        """与独立监控相同的退出条件：完场、无事件区域、0:0 超时；继续轮询返回空串"""
+        match_id = match_info['id']
+        if result.get('finished') or '完场' in self.corner_data[match_id]['match_info'].get('status', ''):
+            return '比赛已完场'
+        if not result.get('has_event'):
+            return '无事件区域'
+
+        now = asyncio.get_event_loop().time()
+        score = self.corner_data[match_id]['match_info'].get('score', '').replace('：', ':')
+        if score == '0:0':
+            match_info.setdefault('zero_score_since', now)
+            if now - match_info['zero_score_since'] > self.close_delay:
+                return '0:0 超时'
+        else:
+            match_info.pop('zero_score_since', None)
+        return ''
+
+    async def sweep_visit(self, page: Page, match_info: Dict) -> str:
+        """轮询标签页访问一场比赛：导航、一次合并提取、合并增量，返回退出原因（继续轮询为空串）"""
+        match_id = match_info['id']
+        await page.goto(match_info['url'], wait_until='domcontentloaded', timeout=30000)
+
+        # 等事件区域出现内容即提取；需要点击才显示的比赛记住，下次直接点击
+        if match_info.get('sweep_click'):
+            try:
+                await page.click(f"text={match_info['sweep_click']}", timeout=1000)
+            except:
+                pass
+        try:
+            await page.wait_for_selector(EVENTS_READY_SELECTOR, timeout=self.sweep_ready_timeout)
+        except Exception:
+            if not match_info.get('sweep_click'):
+                for text in ['动画直播', '直播数据']:
+                    try:
+                        await page.click(f'text={text}', timeout=500)
+                        await page.wait_for_selector(EVENTS_READY_SELECTOR, timeout=1000)
+                        match_info['sweep_click'] = text
+                        break
+                    except:
+                        continue
+
+        result = await page.evaluate(SWEEP_EXTRACT_JS)
+        info = dict(result.get('info') or {})
+        if result.get('finished'):
+            info['status'] = '完场'
+        new_corners, new_all = self.merge_match_state(
+            match_id, info, result.get('corners') or [], result.get('events') or []
+        )
+        self.mark_startup('first_match')
+        if new_corners:
+            self.save_corner_data()
+            print(f"[{match_id}] 🎯 (轮询) 新增 {len(new_corners)} 个角球:")
+            for c in new_corners:
+                print(f"    ⚽ {c}")
+        return self.sweep_exit_reason(match_info, result)
+
+    async def sweep_worker(self, worker_id: int):
+        """共享标签页：按到期时间依次刷新轮询队列中的比赛"""
+        page = await self.take_page()
+        self.sweep_pages.append(page)
+        loop = asyncio.get_event_loop()
 
-async def run(self):
-    """主运行函数"""
-    await self.init_browser(headless=True)
-    
-    try:
         while True:
-            matches = await self.get_live_matches()
-            
-            if not matches:
-                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 暂无进行中的比赛，等待 {self.refresh_interval}s 后重新扫描...")
-                await asyncio.sleep(self.refresh_interval)
+            if not self.sweep_queue:
+                await asyncio.sleep(1)
                 continue
-            
-            # 启动新比赛的监控
-            tasks = []
-            for match in matches:
-                if match['id'] not in self.monitoring_pages:
+
+            due, match_id = self.sweep_queue[0]
+            if match_id not in self.sweep_matches:
+                heapq.heappop(self.sweep_queue)
+                continue
+            if due > loop.time():
+                await asyncio.sleep(min(due - loop.time(), 1))
+                continue
+            heapq.heappop(self.sweep_queue)
+
+            match_info = self.sweep_matches[match_id]
+            reason = ''
+            try:
+                reason = await self.sweep_visit(page, match_info)
+            except Exception as e:
+                # 标签页可能已崩溃或被关闭，换一个新的继续轮询
+                print(f"[{match_id}] 轮询标签页 {worker_id} 访问失败，重建标签页: {e}")
+                if page in self.sweep_pages:
+                    self.sweep_pages.remove(page)
+                try:
+                    await page.close()
+                except:
+                    pass
+                try:
+                    page = await self.take_page()
+                    self.sweep_pages.append(page)
+                except Exception as e:
+                    print(f"轮询标签页 {worker_id} 重建失败: {e}")
+                    await asyncio.sleep(5)
+
+            if reason:
+                self.drop_sweep_match(match_id, reason)
+            # 访问期间可能已被重新扫描移出
+            if match_id not in self.sweep_matches:
+                continue
+            heapq.heappush(self.sweep_queue, (loop.time() + self.sweep_freshness_for(match_id), match_id))
+
+
+    async def run(self):
+        """主运行函数"""
+        await self.init_browser(headless=True)
+        warmup = asyncio.create_task(self.prewarm_pages())
+
+        try:
+            while True:
+                matches = await self.get_live_matches()
+                self.mark_startup('first_scan')
+                if not warmup.done():
+                    await warmup
+
+                if not matches:
+                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 暂无进行中的比赛，等待 {self.refresh_interval}s 后重新扫描...")
+                    await asyncio.sleep(self.refresh_interval)
+                    continue
+
+                if self.sweep_matches:
+                    self.refresh_sweep_matches(matches)
+
+                # 启动新比赛的监控（轮询模式下超出独立标签页上限的比赛进入轮询队列，已完场的不再启动）
+                tasks = []
+                for match in matches:
+                    if match['id'] in self.monitoring_pages or match['id'] in self.sweep_matches:
+                        continue
+                    if '完场' in match.get('status', ''):
+                        continue
+                    if self.sweep_mode and len(self.monitoring_pages) + len(tasks) >= self.max_dedicated_tabs:
+                        self.add_sweep_match(match)
+                        continue
                     task = asyncio.create_task(self.monitor_single_match(match))
                     tasks.append(task)
-            
-            if tasks:
-                print(f"\n启动 {len(tasks)} 场新比赛的监控...")
-                await asyncio.sleep(5)
-            
-            # 等待后重新扫描
-            await asyncio.sleep(self.refresh_interval)
-            
-    except KeyboardInterrupt:
-        print("\n\n检测到中断信号，正在保存数据并关闭...")
-        self.save_corner_data()
-    except Exception as e:
-        print(f"\n主循环异常: {e}")
-        import traceback
-        traceback.print_exc()
-    finally:
-        await self.close_browser()
-        print("✓ 浏览器已关闭，程序退出")
+
+                if self.sweep_mode and self.sweep_matches and not self.sweep_tasks:
+                    self.sweep_tasks = [asyncio.create_task(self.sweep_worker(i)) for i in range(self.sweep_tabs)]
+
+                if tasks:
+                    print(f"\n启动 {len(tasks)} 场新比赛的监控...")
+                    await asyncio.sleep(5)
+
+                # 等待后重新扫描
+                await asyncio.sleep(self.refresh_interval)
+
+        except KeyboardInterrupt:
+            print("\n\n检测到中断信号，正在保存数据并关闭...")
+            self.save_corner_data()
+        except Exception as e:
+            print(f"\n主循环异常: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            await self.close_browser()
+            print("✓ 浏览器已关闭，程序退出")
 
 
 async def main():
@@ -712,11 +1077,44 @@ async def main():
         import traceback
         traceback.print_exc()
     finally:
-        if scraper.browser:
+        if scraper.context:
             await scraper.close_browser()
 
 
+async def serve_browser(port: int = 9222, user_data_dir: str = '.cornoe_profile', headless=True):
+    """常驻浏览器：持久化 profile + CDP 端口，监控程序重启时直接连接"""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        context = await p.chromium.launch_persistent_context(
+            user_data_dir,
+            headless=headless,
+            args=BROWSER_ARGS + [f'--remote-debugging-port={port}'],
+            **CornerKickScraper().context_options()
+        )
+        print(f"✓ 常驻浏览器已启动: http://127.0.0.1:{port} (profile: {user_data_dir})")
+        print(f"  监控程序复用: CORNOE_CDP_URL=http://127.0.0.1:{port} python cornoe.py")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await context.close()
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='足球角球实时监控')
+    parser.add_argument('--browser-server', action='store_true', help='只启动常驻浏览器（CDP），供监控程序重启时复用')
+    parser.add_argument('--cdp-port', type=int, default=9222)
+    args = parser.parse_args()
+
+    if args.browser_server:
+        try:
+            asyncio.run(serve_browser(args.cdp_port, os.environ.get('CORNOE_USER_DATA_DIR', '.cornoe_profile')))
+        except KeyboardInterrupt:
+            print("\n常驻浏览器已关闭")
+        raise SystemExit(0)
+
     print("="*80)
     print("足球角球实时监控系统 (DOM解析版 - 无头模式 - 增强版)".center(80))
     print("="*80)
@@ -0,0 +1,478 @@
+import argparse
+import asyncio
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional
+
+from corner_analytics import parse_minute_parts
+
+
+MATCH_SECONDS = 90 * 60
+MIN_SPEED = 1.0
+MAX_SPEED = 50.0
+TEAM_NAMES = [
+    '北京国安', '上海海港', '山东泰山', '成都蓉城', '浙江队', '天津津门虎', '长春亚泰', '河南队',
+    '武汉三镇', '青岛海牛', '深圳新鹏城', '梅州客家', '沧州雄狮', '南通支云', '大连人', '广州队',
+]
+LEAGUES = ['中超', '中甲', '英超', '西甲', '意甲', '德甲', '法甲', '日职']
+
+
+class ReplaySite:
+    """本地模拟站点：按时间轴放出角球和事件，结构与 /live/ 页面保持一致"""
+
+    def __init__(self, matches: List[Dict], speed: float = 1.0, poll_interval: float = 1.0):
+        if not MIN_SPEED <= speed <= MAX_SPEED:
+            raise ValueError(f"回放速度必须在 {MIN_SPEED:g}~{MAX_SPEED:g} 倍之间: {speed}")
+        self.matches = {m['id']: m for m in matches}
+        self.speed = speed
+        self.poll_interval = poll_interval
+        self.started = time.time()
+
+    @classmethod
+    def synthetic(cls, count: int, speed: float = 1.0, corner_interval: float = 8.0,
+                  event_interval: float = 12.0, seed: int = 0, **kwargs) -> 'ReplaySite':
+        """生成 count 场合成比赛（间隔单位为比赛分钟，按指数分布随机）"""
+        matches = []
+        for i in range(count):
+            rng = random.Random(seed * 100003 + i)
+            home, away = rng.sample(TEAM_NAMES, 2)
+            match = {
+                'id': str(900000 + i),
+                'league': rng.choice(LEAGUES),
+                'home': home,
+                'away': away,
+                'start_second': rng.randint(0, 80) * 60,
+                'final_score': None,
+                'events': []
+            }
+            schedule = []
+            for kind, interval in [('corner', corner_interval), ('other', event_interval)]:
+                second = 0.0
+                while interval > 0:
+                    second += rng.expovariate(1.0 / (interval * 60))
+                    if second >= MATCH_SECONDS:
+                        break
+                    schedule.append((int(second), kind, rng.choice(['home', 'away'])))
+            schedule.sort()
+
+            corner_no = {'home': 0, 'away': 0}
+            for second, kind, side in schedule:
+                minute = second // 60 + 1
+                team = match[side]
+                side_label = '主队' if side == 'home' else '客队'
+                if kind == 'corner':
+                    corner_no[side] += 1
+                    text = f"{minute}' {side_label}{team}获得第{corner_no[side]}个角球"
+                else:
+                    kind = rng.choice(['goal', 'yellow', 'sub'])
+                    text = {
+                        'goal': f"{minute}' {side_label}{team}进球",
+                        'yellow': f"{minute}' {side_label}{team}黄牌",
+                        'sub': f"{minute}' {side_label}{team}换人",
+                    }[kind]
+                match['events'].append({'second': second, 'kind': kind, 'side': side, 'text': text})
+            matches.append(match)
+        return cls(matches, speed=speed, **kwargs)
+
+    @classmethod
+    def from_corner_file(cls, path: str, speed: float = 1.0, **kwargs) -> 'ReplaySite':
+        """从 save_corner_data 输出的 JSON 回放已记录的角球事件"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        matches = []
+        for match_id, record in data.get('matches', {}).items():
+            info = record.get('match_info', {})
+            events = []
+            last_second = 0
+            for text in record.get('events', []):
+                parts = parse_minute_parts(text)
+                if parts:
+                    # 补时压缩进常规分钟内（45+2' 在 45' 之后、46' 之前）
+                    base, extra = parts
+                    last_second = max(0, base - 1) * 60 + min(extra, 9) * 6
+                side = 'away' if ('客队' in text or '客' in text) else 'home'
+                kind = 'corner' if '角球' in text else 'other'
+                events.append({'second': last_second, 'kind': kind, 'side': side, 'text': text})
+            events.sort(key=lambda e: e['second'])
+            matches.append({
+                'id': str(match_id),
+                'league': info.get('league', ''),
+                'home': info.get('home', ''),
+                'away': info.get('away', ''),
+                'start_second': 0,
+                'final_score': info.get('score') or None,
+                'events': events
+            })
+        return cls(matches, speed=speed, **kwargs)
+
+    def match_second(self, match: Dict, now: Optional[float] = None) -> float:
+        """当前比赛进行到的秒数"""
+        now = time.time() if now is None else now
+        return match['start_second'] + (now - self.started) * self.speed
+
+    def emitted_at(self, match: Dict, event: Dict) -> float:
+        """事件在站点上出现的墙上时间（开始前已发生的事件视为启动时出现）"""
+        return self.started + max(0.0, (event['second'] - match['start_second']) / self.speed)
+
+    def snapshot(self, match: Dict) -> Dict:
+        """比赛当前可见状态"""
+        second = self.match_second(match)
+        events = [e for e in match['events'] if e['second'] <= second]
+        if second >= MATCH_SECONDS:
+            status = '完场'
+        else:
+            status = f"{int(second // 60) + 1}'"
+
+        if match['final_score']:
+            score = match['final_score']
+        else:
+            goals = {'home': 0, 'away': 0}
+            for e in events:
+                if e['kind'] == 'goal':
+                    goals[e['side']] += 1
+            score = f"{goals['home']}:{goals['away']}"
+
+        return {
+            'id': match['id'],
+            'home': match['home'],
+            'away': match['away'],
+            'score': score,
+            'status': status,
+            'events': [e['text'] for e in events],
+            'corners': [e['text'] for e in events if e['kind'] == 'corner']
+        }
+
+    def emitted_corners(self, until: Optional[float] = None) -> List[Dict]:
+        """截至 until 已放出的角球及出现时间，用于计算检测延迟"""
+        until = time.time() if until is None else until
+        emitted = []
+        for match in self.matches.values():
+            for event in match['events']:
+                if event['kind'] != 'corner':
+                    continue
+                at = self.emitted_at(match, event)
+                if at <= until:
+                    emitted.append({'match_id': match['id'], 'text': event['text'], 'emitted_at': at})
+        return emitted
+
+    def render_live_list(self) -> str:
+        """渲染 /live/ 比赛列表"""
+        rows = []
+        for match in self.matches.values():
+            snap = self.snapshot(match)
+            href = f"/live/{match['id']}/"
+            rows.append(
+                f'<tr data-mid="{match["id"]}">'
+                f'<td>{html.escape(match["league"])}</td>'
+                f'<td>{html.escape(snap["status"])}</td>'
+                f'<td><a href="{href}">{html.escape(snap["home"])}</a></td>'
+                f'<td>{html.escape(snap["score"])}</td>'
+                f'<td><a href="{href}">{html.escape(snap["away"])}</a></td>'
+                f'</tr>'
+            )
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>live</title></head><body>'
+            '<table>' + ''.join(rows) + '</table></body></html>'
+        )
+
+    def render_match_page(self, match: Dict) -> str:
+        """渲染单场比赛页面，时间轴由页面脚本轮询 /api/match/ 更新"""
+        snap = self.snapshot(match)
+        return f'''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(snap["home"])} vs {html.escape(snap["away"])}</title></head>
+<body>
+<div class="match-info">
+  <span class="home">{html.escape(snap["home"])}</span>
+  <span class="score">{html.escape(snap["score"])}</span>
+  <span class="away">{html.escape(snap["away"])}</span>
+  <span class="time">{html.escape(snap["status"])}</span>
+</div>
+<a href="#animation">动画直播</a>
+<div class="timeline" id="animation"></div>
+<script>
+const MATCH_ID = {json.dumps(match["id"])};
+function render(data) {{
+  document.querySelector('.score').innerText = data.score;
+  document.querySelector('.time').innerText = data.status;
+  const timeline = document.getElementById('animation');
+  const corners = new Set(data.corners);
+  for (let i = timeline.children.length; i < data.events.length; i++) {{
+    const text = data.events[i];
+    const row = document.createElement('div');
+    row.className = 'event';
+    const span = document.createElement('span');
+    span.innerText = text;
+    row.appendChild(span);
+    if (corners.has(text)) {{
+      const img = document.createElement('img');
+      img.className = 'corner_tips';
+      img.setAttribute('title', text);
+      img.src = 'data:,';
+      row.appendChild(img);
+    }}
+    timeline.appendChild(row);
+  }}
+}}
+async function poll() {{
+  try {{
+    const resp = await fetch('/api/match/' + MATCH_ID);
+    render(await resp.json());
+  }} catch (e) {{}}
+}}
+poll();
+setInterval(poll, {int(self.poll_interval * 1000)});
+</script>
+</body></html>'''
+
+
+def make_handler(site: ReplaySite):
+    """构造绑定到 site 的请求处理器"""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def _send(self, body: str, content_type: str, status: int = 200):
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path in ('/', '/live', '/live/'):
+                return self._send(site.render_live_list(), 'text/html')
+
+            found = re.fullmatch(r'/live/([^/]+)/?', path)
+            if found and found.group(1) in site.matches:
+                return self._send(site.render_match_page(site.matches[found.group(1)]), 'text/html')
+
+            found = re.fullmatch(r'/api/match/([^/]+)', path)
+            if found and found.group(1) in site.matches:
+                snap = site.snapshot(site.matches[found.group(1)])
+                return self._send(json.dumps(snap, ensure_ascii=False), 'application/json')
+
+            if path == '/stats':
+                stats = {
+                    'speed': site.speed,
+                    'matches': len(site.matches),
+                    'elapsed': time.time() - site.started,
+                    'emitted_corners': site.emitted_corners()
+                }
+                return self._send(json.dumps(stats, ensure_ascii=False), 'application/json')
+
+            self._send('not found', 'text/plain', status=404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def start_server(site: ReplaySite, host: str = '127.0.0.1', port: int = 8599) -> ThreadingHTTPServer:
+    """在后台线程启动模拟站点，返回 server（调用 shutdown() 停止）"""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def process_tree_rss_mb() -> float:
+    """当前进程及其所有子进程（含浏览器）的常驻内存，单位MB。
+
+    Linux 下读取 /proc；其他平台需要安装 psutil 才能统计子进程，
+    否则只能返回本进程的峰值内存（不含浏览器）。
+    """
+    if not os.path.isdir('/proc'):
+        try:
+            import psutil
+        except ImportError:
+            import resource
+            import sys
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # macOS 的 ru_maxrss 单位是字节，Linux/BSD 是 KB
+            return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+        proc = psutil.Process()
+        total = 0
+        for p in [proc] + proc.children(recursive=True):
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    children = {}
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/stat', 'r') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(pid))
+        except (OSError, ValueError, IndexError):
+            continue
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    stack = [os.getpid()]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(pid, []))
+    return total / (1024 * 1024)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def measure_load(match_count: int, speed: float = 10.0, duration: float = 120.0,
+                       port: int = 8599, grace: float = 15.0, **site_kwargs) -> Dict:
+    """用 match_count 场合成比赛压测 CornerKickScraper，统计检测延迟和内存"""
+    from cornoe import CornerKickScraper
+
+    site = ReplaySite.synthetic(match_count, speed=speed, **site_kwargs)
+    server = start_server(site, port=port)
+    scraper = CornerKickScraper(base_url=f'http://127.0.0.1:{port}')
+    # 压测必须全新启动浏览器，内存统计才包含浏览器进程
+    scraper.cdp_url = None
+    scraper.user_data_dir = None
+    scraper.corner_file = os.devnull
+    scraper.print_live_table = lambda: None
+
+    first_seen = {}
+    rss_samples = []
+    tasks = []
+    try:
+        await scraper.init_browser(headless=True)
+        matches = await scraper.get_live_matches()
+        tasks = [asyncio.create_task(scraper.monitor_single_match(m)) for m in matches]
+        monitor_started = time.time()
+
+        deadline = time.time() + duration
+        while time.time() < deadline:
+            now = time.time()
+            for match_id, data in list(scraper.corner_only_data.items()):
+                for text in data.get('corners', []):
+                    first_seen.setdefault((match_id, text), now)
+            rss_samples.append(process_tree_rss_mb())
+            await asyncio.sleep(0.5)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await scraper.close_browser()
+        server.shutdown()
+        server.server_close()
+
+    # 只统计监控启动后放出、且留有足够检测时间的角球
+    latencies = []
+    missed = 0
+    for corner in site.emitted_corners(until=deadline - grace):
+        if corner['emitted_at'] < monitor_started:
+            continue
+        seen = [t for (mid, text), t in first_seen.items()
+                if mid == corner['match_id'] and corner['text'] in text]
+        if seen:
+            latencies.append(max(0.0, min(seen) - corner['emitted_at']))
+        else:
+            missed += 1
+
+    return {
+        'matches': match_count,
+        'monitored': len(tasks),
+        'corners': len(latencies) + missed,
+        'missed': missed,
+        'latency_p50': _percentile(latencies, 50),
+        'latency_p95': _percentile(latencies, 95),
+        'latency_max': max(latencies) if latencies else 0.0,
+        'rss_peak_mb': max(rss_samples) if rss_samples else 0.0
+    }
+
+
+async def find_capacity(match_counts: List[int], max_p95: float = 15.0, **kwargs) -> List[Dict]:
+    """依次压测不同并发场数，打印结果并给出最大可持续场数"""
+    results = []
+    sustainable = 0
+    for count in match_counts:
+        print(f"\n[{time.strftime('%H:%M:%S')}] 压测 {count} 场比赛...")
+        result = await measure_load(count, **kwargs)
+        result['sustainable'] = result['missed'] == 0 and result['latency_p95'] <= max_p95
+        results.append(result)
+        print(f"  监控 {result['monitored']} 场 | 角球 {result['corners']} 漏检 {result['missed']} | "
+              f"延迟 p50 {result['latency_p50']:.1f}s p95 {result['latency_p95']:.1f}s "
+              f"max {result['latency_max']:.1f}s | 内存峰值 {result['rss_peak_mb']:.0f}MB")
+        if result['sustainable']:
+            sustainable = count
+    print(f"\n✓ 最大可持续并发: {sustainable} 场 (p95 延迟 ≤ {max_p95}s 且无漏检)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='角球监控本地模拟站点 / 回放 / 压测')
+    sub = parser.add_subparsers(dest='command')
+
+    serve = sub.add_parser('serve', help='启动模拟站点')
+    serve.add_argument('--port', type=int, default=8599)
+    serve.add_argument('--matches', type=int, default=20, help='合成比赛场数')
+    serve.add_argument('--speed', type=float, default=1.0, help=f'时间倍速（{MIN_SPEED:g}~{MAX_SPEED:g}）')
+    serve.add_argument('--corner-interval', type=float, default=8.0, help='平均每隔多少比赛分钟一个角球')
+    serve.add_argument('--event-interval', type=float, default=12.0, help='平均每隔多少比赛分钟一个其他事件')
+    serve.add_argument('--seed', type=int, default=0)
+    serve.add_argument('--replay', help='回放 save_corner_data 输出的 JSON 文件')
+
+    bench = sub.add_parser('bench', help='压测 CornerKickScraper')
+    bench.add_argument('--port', type=int, default=8599)
+    bench.add_argument('--counts', default='10,20,50', help='逗号分隔的并发场数')
+    bench.add_argument('--speed', type=float, default=10.0, help=f'时间倍速（{MIN_SPEED:g}~{MAX_SPEED:g}）')
+    bench.add_argument('--duration', type=float, default=120.0, help='每档压测秒数')
+    bench.add_argument('--max-p95', type=float, default=15.0, help='可接受的 p95 检测延迟（秒）')
+    bench.add_argument('--corner-interval', type=float, default=8.0)
+    bench.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        counts = [int(c) for c in args.counts.split(',') if c.strip()]
+        asyncio.run(find_capacity(counts, max_p95=args.max_p95, speed=args.speed,
+                                  duration=args.duration, port=args.port,
+                                  corner_interval=args.corner_interval, seed=args.seed))
+        return
+
+    if args.command != 'serve':
+        parser.print_help()
+        return
+
+    if args.replay:
+        site = ReplaySite.from_corner_file(args.replay, speed=args.speed)
+    else:
+        site = ReplaySite.synthetic(args.matches, speed=args.speed, corner_interval=args.corner_interval,
+                                    event_interval=args.event_interval, seed=args.seed)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(site))
+    print(f"✓ 模拟站点已启动: http://127.0.0.1:{args.port}/live/ ({len(site.matches)} 场, {args.speed}x)")
+    print(f"  运行监控: CORNOE_BASE_URL=http://127.0.0.1:{args.port} python cornoe.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n模拟站点已停止")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
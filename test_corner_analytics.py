@@ -0,0 +1,106 @@
+import random
+import sys
+
+import pytest
+
+from corner_analytics import CornerAnalytics, parse_minute
+
+
+def make_history(count=40, seed=1):
+    rng = random.Random(seed)
+    data = {}
+    for i in range(count):
+        corners = []
+        for _ in range(rng.randint(0, 12)):
+            side = '主队' if rng.random() < 0.5 else '客队'
+            if rng.random() < 0.1:
+                corners.append(f"45+{rng.randint(1, 4)}' {side}获得角球")
+            else:
+                corners.append(f"{rng.randint(1, 95)}' {side}获得角球")
+        if rng.random() < 0.2:
+            corners.append('角球（无时间）')
+        data[str(i)] = {
+            'match_info': {
+                'status': rng.choice([f"{rng.randint(50, 95)}'", '中场', '完场']),
+                'score': f"{rng.randint(0, 3)}:{rng.randint(0, 3)}",
+                'league': rng.choice(['中超', '英超'])
+            },
+            'corners': corners
+        }
+    return data
+
+
+def snapshot(analytics, ids):
+    return analytics.summary(), {m: analytics.match_stats(m) for m in ids}
+
+
+def test_parse_minute_folds_stoppage_time():
+    assert parse_minute("45+2' 主队获得角球") == 47
+    assert parse_minute("35' 客队获得角球") == 35
+    assert parse_minute('角球') is None
+
+
+def test_window_expires_as_match_advances():
+    analytics = CornerAnalytics(window=10)
+    analytics.update_match('a', {'status': "15'", 'score': '0:0'})
+    analytics.add_corners('a', ["10' 主队获得角球", "12' 客队获得角球", "15' 主队获得角球"])
+    assert analytics.match_stats('a')['last_10min'] == 3
+
+    analytics.update_match('a', {'status': "21'"})
+    assert analytics.match_stats('a')['last_10min'] == 2
+    analytics.update_match('a', {'status': "26'"})
+    assert analytics.match_stats('a')['last_10min'] == 0
+    assert analytics.summary()['last_10min'] == 0
+    assert analytics.match_stats('a')['total'] == 3
+
+
+def test_hot_matches_and_finish_match():
+    analytics = CornerAnalytics(window=10)
+    analytics.update_match('a', {'status': "30'", 'league': '中超'})
+    analytics.update_match('b', {'status': "30'", 'league': '英超'})
+    analytics.add_corners('a', ["25' 主队获得角球", "27' 主队获得角球", "29' 客队获得角球"])
+    analytics.add_corners('b', ["28' 主队获得角球", "29' 客队获得角球"])
+
+    assert analytics.hot_matches(3) == ['a']
+    assert analytics.hot_matches(2) == ['a', 'b']
+    assert analytics.summary()['per_league'] == {'中超': 3, '英超': 2}
+
+    analytics.finish_match('a')
+    assert analytics.hot_matches(2) == ['b']
+    assert analytics.summary()['last_10min'] == 2
+    assert analytics.summary()['total'] == 5
+
+
+def test_first_half_stoppage_counts_as_first_half():
+    analytics = CornerAnalytics()
+    analytics.add_corners('a', ["45+2' 主队获得角球", "46' 客队获得角球"])
+    stats = analytics.match_stats('a')
+    assert (stats['first_half'], stats['second_half']) == (1, 1)
+
+
+def test_backfill_numpy_matches_fallback(monkeypatch):
+    pytest.importorskip('numpy')
+    data = make_history()
+
+    vectorized = CornerAnalytics()
+    vectorized.backfill(data)
+
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    replayed = CornerAnalytics()
+    replayed.backfill(data)
+
+    assert snapshot(vectorized, data) == snapshot(replayed, data)
+    assert vectorized.hot_matches(3) == replayed.hot_matches(3)
+
+
+def test_backlog_from_mid_game_join_skips_score_state():
+    analytics = CornerAnalytics()
+    analytics.update_match('m', {'status': "60'", 'score': '2:0'})
+    analytics.add_corners('m', [f"{minute}' 主队获得角球" for minute in (5, 12, 20, 33, 41, 47, 52, 58)])
+    analytics.update_match('m', {'status': "61'"})
+    analytics.add_corners('m', ["61' 客队获得角球"])
+
+    stats = analytics.match_stats('m')
+    assert stats['total'] == 9
+    assert stats['by_score_state']['领先'] == 1
+    assert stats['rate_per_90_by_score_state']['领先'] == 90.0
@@ -0,0 +1,126 @@
+import html
+import json
+import re
+import time
+import urllib.request
+from html.parser import HTMLParser
+
+import pytest
+
+from replay_server import ReplaySite, start_server
+
+
+# 与 cornoe.LIVE_LIST_JS / TEAM_INFO_JS 中的规则一致
+TIME_PATTERN = re.compile(r"^\d+\s*['′]\s*$")
+SCORE_PATTERN = re.compile(r'^\d+\s*[:：]\s*\d+$')
+
+
+class LiveListParser(HTMLParser):
+    """按 tr[data-mid] 收集每行单元格文本和 /live/ 链接"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'tr' and 'data-mid' in attrs:
+            self.rows.append({'mid': attrs['data-mid'], 'cells': [], 'hrefs': []})
+        elif tag == 'td' and self.rows:
+            self.cell = ''
+        elif tag == 'a' and self.rows and '/live/' in attrs.get('href', ''):
+            self.rows[-1]['hrefs'].append(attrs['href'])
+
+    def handle_endtag(self, tag):
+        if tag == 'td' and self.cell is not None:
+            self.rows[-1]['cells'].append(self.cell.strip())
+            self.cell = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell += data
+
+
+def fixed_site(speed=10.0):
+    match = {
+        'id': '1', 'league': '中超', 'home': '主', 'away': '客', 'start_second': 0, 'final_score': None,
+        'events': [
+            {'second': 300, 'kind': 'corner', 'side': 'home', 'text': "6' 主队获得第1个角球"},
+            {'second': 900, 'kind': 'goal', 'side': 'away', 'text': "16' 客队进球"},
+        ]
+    }
+    return ReplaySite([match], speed=speed)
+
+
+def test_synthetic_schedule_is_deterministic_per_seed():
+    first = ReplaySite.synthetic(5, seed=3)
+    second = ReplaySite.synthetic(5, seed=3)
+    other = ReplaySite.synthetic(5, seed=4)
+    assert first.matches == second.matches
+    assert first.matches != other.matches
+
+
+def test_events_appear_at_scaled_time():
+    site = fixed_site(speed=10.0)
+    match = site.matches['1']
+    corner = match['events'][0]
+    assert site.emitted_at(match, corner) == pytest.approx(site.started + 30.0)
+
+    site.started = time.time() - 29.0
+    assert site.snapshot(match)['corners'] == []
+    site.started = time.time() - 31.0
+    snap = site.snapshot(match)
+    assert snap['corners'] == ["6' 主队获得第1个角球"]
+    assert snap['score'] == '0:0'
+    assert [c['text'] for c in site.emitted_corners()] == ["6' 主队获得第1个角球"]
+
+    site.started = time.time() - 91.0
+    assert site.snapshot(match)['score'] == '0:1'
+
+
+def test_speed_outside_range_is_rejected():
+    for speed in (0, 0.5, 500):
+        with pytest.raises(ValueError):
+            fixed_site(speed=speed)
+
+
+def test_corner_file_replay_orders_stoppage_time(tmp_path):
+    path = tmp_path / 'corner_only_data.json'
+    path.write_text(json.dumps({'matches': {'7': {
+        'match_info': {'home': 'A', 'away': 'B', 'score': '1:0', 'status': '完场'},
+        'events': ["46' 主队获得角球", "45+2' 客队获得角球", "10' 主队获得角球"]
+    }}}, ensure_ascii=False), encoding='utf-8')
+
+    site = ReplaySite.from_corner_file(str(path))
+    events = site.matches['7']['events']
+    assert [e['text'] for e in events] == ["10' 主队获得角球", "45+2' 客队获得角球", "46' 主队获得角球"]
+    assert 44 * 60 <= events[1]['second'] < 45 * 60
+
+
+def test_http_output_matches_scraper_rules():
+    site = ReplaySite.synthetic(3, seed=1)
+    server = start_server(site, port=0)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        parser = LiveListParser()
+        parser.feed(urllib.request.urlopen(f'{base}/live/').read().decode('utf-8'))
+        assert len(parser.rows) == 3
+        for row in parser.rows:
+            href = row['hrefs'][0]
+            assert href.split('/')[-2] == row['mid']
+            league, status, home, score, away = [html.unescape(c) for c in row['cells']]
+            assert league
+            assert TIME_PATTERN.match(status) or status == '完场'
+            assert SCORE_PATTERN.match(score.replace(' ', ''))
+
+            data = json.loads(urllib.request.urlopen(f'{base}/api/match/{row["mid"]}').read())
+            assert (data['home'], data['away']) == (home, away)
+            assert SCORE_PATTERN.match(data['score'])
+            assert set(data['corners']) <= set(data['events'])
+
+            page = urllib.request.urlopen(f'{base}{href}').read().decode('utf-8')
+            assert 'class="score"' in page and 'id="animation"' in page
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+
+from cornoe import CornerKickScraper
+
+
+class FakePage:
+    """只实现轮询用到的方法，evaluate 依次返回预设的提取结果"""
+
+    def __init__(self, results, fail=False):
+        self.results = results
+        self.fail = fail
+        self.visited = []
+        self.closed = False
+
+    async def goto(self, url, **kwargs):
+        if self.fail:
+            raise RuntimeError('Target crashed')
+        self.visited.append(url)
+
+    async def click(self, selector, **kwargs):
+        raise TimeoutError(selector)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        return None
+
+    async def evaluate(self, script):
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+    async def close(self):
+        self.closed = True
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.opened = 0
+
+    async def new_page(self):
+        self.opened += 1
+        return self.pages.pop(0)
+
+
+def extraction(corners=(), status="30'", score='1:0', finished=False, has_event=True):
+    return {
+        'info': {'home': '', 'away': '', 'score': score, 'status': status},
+        'corners': list(corners),
+        'events': list(corners),
+        'has_event': has_event,
+        'finished': finished
+    }
+
+
+def make_scraper(tmp_path, pages=()):
+    scraper = CornerKickScraper(base_url='http://127.0.0.1:1')
+    scraper.corner_file = str(tmp_path / 'corner_only_data.json')
+    scraper.context = FakeContext(pages)
+    return scraper
+
+
+def match(match_id, status="30'"):
+    return {'id': match_id, 'url': f'http://127.0.0.1:1/live/{match_id}/', 'home': 'A', 'away': 'B',
+            'score': '1:0', 'status': status, 'league': '中超'}
+
+
+async def run_worker(scraper, seconds=0.3):
+    task = asyncio.create_task(scraper.sweep_worker(0))
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def test_freshness_priority(tmp_path):
+    scraper = make_scraper(tmp_path)
+    scraper.sweep_freshness, scraper.sweep_hot_freshness = 60, 20
+    scraper.analytics.update_match('hot', {'status': "30'"})
+    scraper.analytics.add_corners('hot', ["27' 主队获得角球", "28' 客队获得角球", "29' 主队获得角球"])
+
+    assert scraper.sweep_freshness_for('cold') == 60
+    assert scraper.sweep_freshness_for('hot') == 20
+    scraper.sweep_freshness_by_match['hot'] = 5
+    assert scraper.sweep_freshness_for('hot') == 5
+
+
+def test_merge_match_state_returns_only_deltas(tmp_path):
+    scraper = make_scraper(tmp_path)
+    scraper.corner_data['1'] = {'match_info': match('1'), 'events': []}
+    scraper.corner_only_data['1'] = {'match_info': match('1'), 'corners': []}
+
+    first = scraper.merge_match_state('1', {'score': '1:1'}, ["10' 主队获得角球"], ["10' 主队获得角球"])
+    second = scraper.merge_match_state('1', {'status': "20'"}, ["10' 主队获得角球", "18' 客队获得角球"], [])
+    assert first == (["10' 主队获得角球"], ["10' 主队获得角球"])
+    assert second == (["18' 客队获得角球"], [])
+    assert scraper.corner_only_data['1']['match_info']['score'] == '1:1'
+    assert scraper.analytics.match_stats('1')['total'] == 2
+
+
+def test_worker_visits_due_matches_and_requeues_by_freshness(tmp_path):
+    async def scenario():
+        page = FakePage([extraction(["12' 主队获得角球"])])
+        scraper = make_scraper(tmp_path, [page])
+        scraper.sweep_freshness = 60
+        scraper.add_sweep_match(match('1'))
+        scraper.add_sweep_match(match('2'))
+        await run_worker(scraper)
+
+        loop = asyncio.get_event_loop()
+        assert sorted(url.split('/')[-2] for url in page.visited) == ['1', '2']
+        assert sorted(m for _, m in scraper.sweep_queue) == ['1', '2']
+        due, _ = heapq.heappop(scraper.sweep_queue)
+        assert 59 < due - loop.time() <= 60
+        assert scraper.corner_only_data['1']['corners'] == ["12' 主队获得角球"]
+
+    asyncio.run(scenario())
+
+
+def test_failed_visit_replaces_tab_and_requeues(tmp_path):
+    async def scenario():
+        broken = FakePage([extraction()], fail=True)
+        healthy = FakePage([extraction()])
+        scraper = make_scraper(tmp_path, [broken, healthy])
+        scraper.sweep_freshness = 0.05
+        scraper.add_sweep_match(match('1'))
+        await run_worker(scraper)
+
+        assert broken.closed
+        assert scraper.sweep_pages == [healthy]
+        assert healthy.visited
+        assert '1' in scraper.sweep_matches
+
+    asyncio.run(scenario())
+
+
+def test_finished_or_empty_matches_leave_the_queue(tmp_path):
+    async def scenario():
+        page = FakePage([extraction(finished=True), extraction(has_event=False)])
+        scraper = make_scraper(tmp_path, [page])
+        scraper.add_sweep_match(match('1'))
+        scraper.add_sweep_match(match('2'))
+        await run_worker(scraper)
+
+        assert scraper.sweep_matches == {}
+        assert scraper.corner_data['1']['match_info']['status'] == '完场'
+
+    asyncio.run(scenario())
+
+
+def test_rescan_updates_and_drops_sweep_matches(tmp_path):
+    async def scenario():
+        scraper = make_scraper(tmp_path)
+        for match_id in ('1', '2', '3'):
+            scraper.add_sweep_match(match(match_id))
+
+        scraper.refresh_sweep_matches([match('1', status="75'"), match('2', status='完场')])
+        assert list(scraper.sweep_matches) == ['1']
+        assert scraper.corner_data['1']['match_info']['status'] == "75'"
+
+    asyncio.run(scenario())